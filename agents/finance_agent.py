@@ -1,21 +1,29 @@
 # agents/finance_agent.py
 
 import os
-import json
+import csv
+import heapq
 import logging
 import re
+import asyncio
 import requests
+from functools import lru_cache
 from typing import List, Dict
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
-import pandas as pd
-import feedparser
+import aiohttp
+import orjson
 from dotenv import load_dotenv
-from newsapi import NewsApiClient
-from langchain_ollama import ChatOllama
+from requests.adapters import HTTPAdapter, Retry
 from langchain.prompts import PromptTemplate
 from dateutil import parser as date_parser
 
+from ..core.http import NEWSAPI_ENDPOINT, fetch_json, fetch_feed, make_session
+from ..utils.dedup import deduplicate_articles
+from ..core.llm import get_llm
+from ..utils.summary import need_llm_summary, format_title_bullets
+
 # ------------------------------
 # Logging setup
 # ------------------------------
@@ -35,8 +43,19 @@ STOCK_API_KEY = os.getenv("STOCK_API_KEY")
 # ------------------------------
 # Clients
 # ------------------------------
-newsapi = NewsApiClient(api_key=NEWS_API_KEY)
-llm = ChatOllama(model="llama3.1:8b", temperature=0)
+llm = get_llm()
+
+# Shared HTTP session: keep-alive + retries instead of a fresh
+# TCP/TLS handshake on every scheduler tick
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+)
 
 # ------------------------------
 # Constants
@@ -51,6 +70,8 @@ FINAL_ARTICLES = 5
 
 FINANCE_RSS_FEED = "https://www.moneycontrol.com/rss/latestnews.xml"
 
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
 # ------------------------------
 # Prompts
 # ------------------------------
@@ -107,11 +128,27 @@ Articles:
 # ------------------------------
 # Helpers
 # ------------------------------
+_DATETIME_MIN = datetime.min.replace(tzinfo=timezone.utc)
+
+
 def parse_date_safe(date_str: str):
+    if not date_str:
+        return _DATETIME_MIN
+
+    # NewsAPI dates are ISO 8601, RSS dates are RFC 2822; try the cheap
+    # format-specific parsers before falling back to dateutil
     try:
-        return date_parser.parse(date_str)
-    except Exception:
-        return datetime.min
+        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(date_str)
+        except Exception:
+            try:
+                dt = date_parser.parse(date_str)
+            except Exception:
+                return _DATETIME_MIN
+
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 def normalize_article(a: Dict, source: str) -> Dict:
@@ -127,21 +164,42 @@ def normalize_article(a: Dict, source: str) -> Dict:
 # ------------------------------
 # Stock Price
 # ------------------------------
+def _load_symbols() -> Dict[str, str]:
+    """
+    Load lowercased company name -> NSE symbol once at import time.
+    """
+    symbols = {}
+    try:
+        with open(CSV_PATH, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("NAME OF COMPANY") or "").strip().lower()
+                symbol = (row.get("SYMBOL") or "").strip()
+                if name and symbol:
+                    symbols[name] = symbol
+    except OSError:
+        logger.warning(f"NSE symbols CSV not found: {CSV_PATH}")
+    return symbols
+
+
+_SYMBOL_BY_NAME = _load_symbols()
+
+
 def get_stock_price() -> str:
-    if not os.path.exists(CSV_PATH):
+    if not _SYMBOL_BY_NAME:
         return "CSV not found"
 
-    df = pd.read_csv(CSV_PATH)
-    df["NAME OF COMPANY"] = df["NAME OF COMPANY"].str.lower()
-
-    match = df[df["NAME OF COMPANY"].str.contains(STOCK.lower(), na=False)]
-    if match.empty:
+    stock = STOCK.lower()
+    match = next(
+        (s for name, s in _SYMBOL_BY_NAME.items() if stock in name),
+        None
+    )
+    if match is None:
         return "Stock not found"
 
-    symbol = f"{match.iloc[0]['SYMBOL']}.NS"
+    symbol = f"{match}.NS"
 
     try:
-        res = requests.get(
+        res = _session.get(
             "https://api.api-ninjas.com/v1/stockprice",
             headers={"X-Api-Key": STOCK_API_KEY},
             params={"ticker": symbol},
@@ -155,25 +213,55 @@ def get_stock_price() -> str:
         return "Stock price fetch failed"
 
 
+# ------------------------------
+# Query Generation
+# ------------------------------
+@lru_cache(maxsize=16)
+def generate_queries(sector: str, stock: str) -> List[str]:
+    """
+    Memoized per (sector, stock): with temperature=0 the LLM output is
+    deterministic, so repeat ticks skip the inference call entirely.
+    """
+    llm_raw = llm.invoke(QUERY_PROMPT.format(
+        SECTOR=sector,
+        STOCK=stock
+    )).content
+
+    match = _JSON_ARRAY_RE.search(llm_raw)
+    return orjson.loads(match.group()) if match else [f"{stock} stock news"]
+
+
 # ------------------------------
 # Fetch NewsAPI
 # ------------------------------
-def fetch_newsapi_articles(queries: List[str]) -> List[Dict]:
-    articles = []
+async def _fetch_newsapi_query(session: aiohttp.ClientSession, q: str) -> List[Dict]:
+    try:
+        logger.info(f"NewsAPI query: {q}")
+        data = await fetch_json(
+            session,
+            NEWSAPI_ENDPOINT,
+            params={
+                "q": q,
+                "language": "en",
+                "sortBy": "publishedAt",
+                "pageSize": MAX_NEWSAPI,
+                "apiKey": NEWS_API_KEY
+            }
+        )
+        return [normalize_article(a, "newsapi") for a in data.get("articles", [])]
+    except Exception as e:
+        logger.warning(f"NewsAPI error for '{q}': {e}")
+        return []
 
-    for q in queries:
-        try:
-            logger.info(f"NewsAPI query: {q}")
-            res = newsapi.get_everything(
-                q=q,
-                language="en",
-                sort_by="publishedAt",
-                page_size=MAX_NEWSAPI
-            )
-            for a in res.get("articles", []):
-                articles.append(normalize_article(a, "newsapi"))
-        except Exception as e:
-            logger.warning(f"NewsAPI error for '{q}': {e}")
+
+async def fetch_newsapi_articles(
+    session: aiohttp.ClientSession,
+    queries: List[str]
+) -> List[Dict]:
+    results = await asyncio.gather(
+        *(_fetch_newsapi_query(session, q) for q in queries)
+    )
+    articles = [a for batch in results for a in batch]
 
     logger.info(f"Fetched {len(articles)} NewsAPI articles")
     return articles[:MAX_NEWSAPI]
@@ -182,9 +270,13 @@ def fetch_newsapi_articles(queries: List[str]) -> List[Dict]:
 # ------------------------------
 # Fetch RSS (Mandatory)
 # ------------------------------
-def fetch_rss_articles() -> List[Dict]:
+async def fetch_rss_articles(session: aiohttp.ClientSession) -> List[Dict]:
     logger.info("Fetching Finance RSS feed")
-    feed = feedparser.parse(FINANCE_RSS_FEED)
+    try:
+        feed = await fetch_feed(session, FINANCE_RSS_FEED)
+    except Exception as e:
+        logger.warning(f"RSS fetch failed: {e}")
+        return []
 
     articles = []
     for entry in feed.entries[:MAX_RSS]:
@@ -199,10 +291,26 @@ def fetch_rss_articles() -> List[Dict]:
     return articles
 
 
+# ------------------------------
+# Source fan-out
+# ------------------------------
+async def _fetch_sources(queries: List[str]):
+    async with make_session() as session:
+        return await asyncio.gather(
+            fetch_newsapi_articles(session, queries),
+            fetch_rss_articles(session),
+            asyncio.to_thread(get_stock_price)
+        )
+
+
 # ------------------------------
 # Summarization
 # ------------------------------
 def summarize_articles(articles: List[Dict]) -> str:
+    if not need_llm_summary(articles):
+        logger.info("Titles are already clean; skipping LLM summarization")
+        return format_title_bullets(articles)
+
     text = "\n".join(
         f"{idx+1}. {a['title']}"
         for idx, a in enumerate(articles)
@@ -226,32 +334,21 @@ def summarize_articles(articles: List[Dict]) -> str:
 def run_finance_agent() -> Dict:
     logger.info("Finance agent started")
 
-    llm_raw = llm.invoke(QUERY_PROMPT.format(
-        SECTOR=SECTOR,
-        STOCK=STOCK
-    )).content
-
-    match = re.search(r"\[.*\]", llm_raw, re.DOTALL)
-    queries = json.loads(match.group()) if match else [f"{STOCK} stock news"]
+    queries = generate_queries(SECTOR, STOCK)
 
-    newsapi_articles = fetch_newsapi_articles(queries)
-    rss_articles = fetch_rss_articles()
+    newsapi_articles, rss_articles, stock_info = asyncio.run(
+        _fetch_sources(queries)
+    )
 
     # Combine + dedupe
-    combined = {}
-    for a in newsapi_articles + rss_articles:
-        if a["url"]:
-            combined[a["url"]] = a
+    articles = deduplicate_articles(newsapi_articles + rss_articles)
 
-    articles = list(combined.values())
-
-    # Sort by recency
-    articles.sort(
-        key=lambda x: parse_date_safe(x.get("published")),
-        reverse=True
+    # Top N by recency; nlargest evaluates the date key once per article
+    final_articles = heapq.nlargest(
+        FINAL_ARTICLES,
+        articles,
+        key=lambda a: parse_date_safe(a.get("published"))
     )
-
-    final_articles = articles[:FINAL_ARTICLES]
     logger.info(f"Final selected finance articles: {len(final_articles)}")
 
     if not final_articles:
@@ -259,7 +356,7 @@ def run_finance_agent() -> Dict:
 
     return {
         "title": "💰 Finance News",
-        "stock_info": get_stock_price(),
+        "stock_info": stock_info,
         "summary": summarize_articles(final_articles),
         "articles": final_articles
     }
@@ -1,20 +1,28 @@
 # agents/sports_agent.py
 
 import os
-import json
 import re
+import heapq
 import logging
+import asyncio
+from functools import lru_cache
 from typing import List, Dict
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 
-import feedparser
+import aiohttp
+import orjson
 from dotenv import load_dotenv
-from newsapi import NewsApiClient
-from langchain_ollama import ChatOllama
 from langchain.prompts import PromptTemplate
 from dateutil import parser as date_parser
 
+from ..core.http import NEWSAPI_ENDPOINT, fetch_json, fetch_feed, make_session
+from ..core.classify_cache import classify_cached, lookup as classify_lookup, add as classify_add
+from ..utils.json_utils import safe_json_loads
+from ..utils.dedup import deduplicate_articles
+from ..core.llm import get_llm
+from ..utils.summary import need_llm_summary, format_title_bullets
+
 # ------------------------------------------------------
 # Logging
 # ------------------------------------------------------
@@ -30,8 +38,7 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
-newsapi = NewsApiClient(api_key=NEWS_API_KEY)
-llm = ChatOllama(model="llama3.1:8b", temperature=0)
+llm = get_llm()
 
 # ------------------------------------------------------
 # Config
@@ -42,7 +49,9 @@ SPORT = "Cricket"   # Cricket | Football
 MAX_NEWSAPI = 10
 MAX_RSS = 10
 FINAL_ARTICLES = 5
-MAX_LLM_WORKERS = 5
+MAX_CLASSIFY_BATCH = 10
+
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
 
 # ------------------------------------------------------
 # RSS Feeds
@@ -85,6 +94,16 @@ Title: {title}
 Content: {content}
 """)
 
+BATCH_CLASSIFY_PROMPT = PromptTemplate.from_template("""
+You are given {count} numbered sports articles.
+For EACH article, decide if it is related to {TEAM} {SPORT}.
+
+Return ONLY a JSON array of {count} booleans, one per article, in order.
+
+Articles:
+{articles}
+""")
+
 SUMMARY_PROMPT = PromptTemplate.from_template("""
 Summarize EACH sports news item separately and return as a list of bullet points.
 
@@ -123,11 +142,27 @@ Articles:
 # ------------------------------------------------------
 # Helpers
 # ------------------------------------------------------
+_DATETIME_MIN = datetime.min.replace(tzinfo=timezone.utc)
+
+
 def parse_date_safe(date_str: str):
+    if not date_str:
+        return _DATETIME_MIN
+
+    # NewsAPI dates are ISO 8601, RSS dates are RFC 2822; try the cheap
+    # format-specific parsers before falling back to dateutil
     try:
-        return date_parser.parse(date_str)
-    except Exception:
-        return datetime.min
+        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(date_str)
+        except Exception:
+            try:
+                dt = date_parser.parse(date_str)
+            except Exception:
+                return _DATETIME_MIN
+
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 def normalize_article(a: Dict, source: str) -> Dict:
@@ -143,19 +178,24 @@ def normalize_article(a: Dict, source: str) -> Dict:
 # ------------------------------------------------------
 # Query Generation
 # ------------------------------------------------------
-def generate_queries() -> List[str]:
-    res = llm.invoke(QUERY_PROMPT.format(TEAM=TEAM, SPORT=SPORT))
-    match = re.search(r"\[.*\]", res.content, re.DOTALL)
+@lru_cache(maxsize=16)
+def generate_queries(team: str, sport: str) -> List[str]:
+    """
+    Memoized per (team, sport): with temperature=0 the LLM output is
+    deterministic, so repeat ticks skip the inference call entirely.
+    """
+    res = llm.invoke(QUERY_PROMPT.format(TEAM=team, SPORT=sport))
+    match = _JSON_ARRAY_RE.search(res.content)
 
     if match:
         try:
-            queries = json.loads(match.group())
+            queries = orjson.loads(match.group())
             if queries:
                 return queries
         except Exception:
             pass
 
-    fallback = [f"{TEAM} {SPORT} news"]
+    fallback = [f"{team} {sport} news"]
     logger.warning(f"Using fallback query: {fallback}")
     return fallback
 
@@ -163,22 +203,34 @@ def generate_queries() -> List[str]:
 # ------------------------------------------------------
 # Fetch NewsAPI
 # ------------------------------------------------------
-def fetch_newsapi_articles(queries: List[str]) -> List[Dict]:
-    articles = []
-
-    for q in queries:
-        try:
-            logger.info(f"NewsAPI query: {q}")
-            res = newsapi.get_everything(
-                q=q,
-                language="en",
-                sort_by="publishedAt",
-                page_size=MAX_NEWSAPI
-            )
-            for a in res.get("articles", []):
-                articles.append(normalize_article(a, "newsapi"))
-        except Exception as e:
-            logger.error(f"NewsAPI error for '{q}': {e}")
+async def _fetch_newsapi_query(session: aiohttp.ClientSession, q: str) -> List[Dict]:
+    try:
+        logger.info(f"NewsAPI query: {q}")
+        data = await fetch_json(
+            session,
+            NEWSAPI_ENDPOINT,
+            params={
+                "q": q,
+                "language": "en",
+                "sortBy": "publishedAt",
+                "pageSize": MAX_NEWSAPI,
+                "apiKey": NEWS_API_KEY
+            }
+        )
+        return [normalize_article(a, "newsapi") for a in data.get("articles", [])]
+    except Exception as e:
+        logger.error(f"NewsAPI error for '{q}': {e}")
+        return []
+
+
+async def fetch_newsapi_articles(
+    session: aiohttp.ClientSession,
+    queries: List[str]
+) -> List[Dict]:
+    results = await asyncio.gather(
+        *(_fetch_newsapi_query(session, q) for q in queries)
+    )
+    articles = [a for batch in results for a in batch]
 
     logger.info(f"Fetched {len(articles)} NewsAPI articles")
     return articles[:MAX_NEWSAPI]
@@ -187,42 +239,144 @@ def fetch_newsapi_articles(queries: List[str]) -> List[Dict]:
 # ------------------------------------------------------
 # Fetch RSS (Mandatory)
 # ------------------------------------------------------
-def fetch_rss_articles() -> List[Dict]:
-    feeds = get_rss_feeds()
-    articles = []
-
-    for feed_url in feeds:
-        logger.info(f"Fetching RSS: {feed_url}")
-        feed = feedparser.parse(feed_url)
-        for entry in feed.entries[:MAX_RSS]:
-            articles.append(normalize_article({
-                "title": entry.get("title"),
-                "summary": entry.get("summary"),
-                "link": entry.get("link"),
-                "published": entry.get("published")
-            }, "rss"))
+async def _fetch_one_feed(session: aiohttp.ClientSession, feed_url: str) -> List[Dict]:
+    logger.info(f"Fetching RSS: {feed_url}")
+    try:
+        feed = await fetch_feed(session, feed_url)
+    except Exception as e:
+        logger.error(f"RSS fetch failed for {feed_url}: {e}")
+        return []
+
+    return [
+        normalize_article({
+            "title": entry.get("title"),
+            "summary": entry.get("summary"),
+            "link": entry.get("link"),
+            "published": entry.get("published")
+        }, "rss")
+        for entry in feed.entries[:MAX_RSS]
+    ]
+
+
+async def fetch_rss_articles(session: aiohttp.ClientSession) -> List[Dict]:
+    # One task per feed so the fetches overlap instead of queueing
+    results = await asyncio.gather(
+        *(_fetch_one_feed(session, url) for url in get_rss_feeds())
+    )
+    articles = [a for batch in results for a in batch]
 
     logger.info(f"Fetched {len(articles)} RSS articles")
     return articles
 
 
+# ------------------------------------------------------
+# Source fan-out
+# ------------------------------------------------------
+async def _fetch_sources(queries: List[str]):
+    async with make_session() as session:
+        return await asyncio.gather(
+            fetch_newsapi_articles(session, queries),
+            fetch_rss_articles(session)
+        )
+
+
 # ------------------------------------------------------
 # LLM Classification
 # ------------------------------------------------------
 def classify_article(article: Dict) -> bool:
-    res = llm.invoke(CLASSIFY_PROMPT.format(
-        TEAM=TEAM,
-        SPORT=SPORT,
-        title=article["title"],
-        content=article["summary"]
-    ))
-    return res.content.strip().upper().startswith("YES")
+    def _classify() -> bool:
+        prompt = CLASSIFY_PROMPT.format(
+            TEAM=TEAM,
+            SPORT=SPORT,
+            title=article["title"],
+            content=article["summary"]
+        )
+
+        # Only the leading YES/NO matters; stop decoding once it arrives
+        text = ""
+        stream = llm.stream(prompt)
+        try:
+            for chunk in stream:
+                text += chunk.content
+                head = text.strip().upper()
+                if head.startswith("YES") or head.startswith("NO"):
+                    break
+        finally:
+            stream.close()
+
+        return text.strip().upper().startswith("YES")
+
+    return classify_cached(
+        f"{article['title']}\n{article['summary']}",
+        _classify
+    )
+
+
+def _as_label(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().upper() in ("YES", "TRUE", "Y")
+    return bool(value)
+
+
+def _classify_batch(batch: List[Dict]) -> List[bool]:
+    labels = []
+    vectors = []
+    misses = []
+
+    for idx, a in enumerate(batch):
+        vec, label = classify_lookup(f"{a['title']}\n{a['summary']}")
+        vectors.append(vec)
+        labels.append(label)
+        if label is None:
+            misses.append(idx)
+
+    if not misses:
+        return labels
+
+    numbered = "\n".join(
+        f"{i+1}. {batch[idx]['title']} — {batch[idx]['summary']}"
+        for i, idx in enumerate(misses)
+    )
+
+    decisions = None
+    try:
+        res = llm.invoke(BATCH_CLASSIFY_PROMPT.format(
+            TEAM=TEAM,
+            SPORT=SPORT,
+            count=len(misses),
+            articles=numbered
+        ))
+        decisions = safe_json_loads(res.content)
+    except Exception as e:
+        logger.error(f"Batch classification failed: {e}")
+
+    if isinstance(decisions, list) and len(decisions) == len(misses):
+        for i, idx in enumerate(misses):
+            labels[idx] = _as_label(decisions[i])
+            classify_add(vectors[idx], labels[idx])
+    else:
+        logger.warning("Unparsable batch decisions, classifying per article")
+        for idx in misses:
+            labels[idx] = classify_article(batch[idx])
+
+    return [bool(label) for label in labels]
+
+
+def classify_articles(articles: List[Dict]) -> List[bool]:
+    labels = []
+    for start in range(0, len(articles), MAX_CLASSIFY_BATCH):
+        labels.extend(_classify_batch(articles[start:start + MAX_CLASSIFY_BATCH]))
+    return labels
 
 
 # ------------------------------------------------------
 # Summarization
 # ------------------------------------------------------
 def summarize_articles(articles: List[Dict]) -> str:
+    if not need_llm_summary(articles):
+        logger.info("Titles are already clean; skipping LLM summarization")
+        return format_title_bullets(articles)
+
     content = "\n".join(
         f"{idx+1}. {a['title']}"
         for idx, a in enumerate(articles)
@@ -242,34 +396,24 @@ def summarize_articles(articles: List[Dict]) -> str:
 def run_sports_agent() -> Dict:
     logger.info("🏏 Sports agent started")
 
-    queries = generate_queries()
+    queries = generate_queries(TEAM, SPORT)
 
-    newsapi_articles = fetch_newsapi_articles(queries)
-    rss_articles = fetch_rss_articles()   # ✅ mandatory
+    newsapi_articles, rss_articles = asyncio.run(_fetch_sources(queries))
 
     # Combine + deduplicate
-    combined = {}
-    for a in newsapi_articles + rss_articles:
-        if a["url"]:
-            combined[a["url"]] = a
-
-    articles = list(combined.values())
-
-    # Sort by recency
-    articles.sort(
-        key=lambda x: parse_date_safe(x.get("published")),
-        reverse=True
+    articles = deduplicate_articles(newsapi_articles + rss_articles)
+
+    # Batched classification: one LLM call per chunk instead of one per article
+    labels = classify_articles(articles)
+    relevant = [a for a, keep in zip(articles, labels) if keep]
+
+    # Top N most recent relevant articles; nlargest evaluates the
+    # date key once per article and avoids the full sort
+    final_articles = heapq.nlargest(
+        FINAL_ARTICLES,
+        relevant,
+        key=lambda a: parse_date_safe(a.get("published"))
     )
-
-    # Parallel classification
-    relevant = []
-    with ThreadPoolExecutor(max_workers=MAX_LLM_WORKERS) as exe:
-        futures = {exe.submit(classify_article, a): a for a in articles}
-        for f in as_completed(futures):
-            if f.result():
-                relevant.append(futures[f])
-
-    final_articles = relevant[:FINAL_ARTICLES]
     logger.info(f"Final sports articles selected: {len(final_articles)}")
 
     if not final_articles:
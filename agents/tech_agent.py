@@ -1,18 +1,24 @@
 # agents/tech_agent.py
 
 import os
-import json
 import re
 import logging
+import asyncio
+from functools import lru_cache
 from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import feedparser
+import aiohttp
+import orjson
 from dotenv import load_dotenv
-from newsapi import NewsApiClient
-from langchain_ollama import ChatOllama
 from langchain.prompts import PromptTemplate
 
+from ..core.http import NEWSAPI_ENDPOINT, fetch_json, fetch_feed, make_session
+from ..core.classify_cache import classify_cached, lookup as classify_lookup, add as classify_add
+from ..utils.json_utils import safe_json_loads
+from ..utils.dedup import deduplicate_articles
+from ..core.llm import get_llm
+from ..utils.summary import need_llm_summary, format_title_bullets
+
 # ------------------------------------------------------
 # Logging setup
 # ------------------------------------------------------
@@ -31,15 +37,14 @@ NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 # ------------------------------------------------------
 # Clients
 # ------------------------------------------------------
-newsapi = NewsApiClient(api_key=NEWS_API_KEY)
-llm = ChatOllama(model="llama3.1:8b", temperature=0)
+llm = get_llm()
 
 # ------------------------------------------------------
 # Constants
 # ------------------------------------------------------
 TECH = "Artificial Intelligence"
 
-MAX_LLM_WORKERS = 5
+MAX_CLASSIFY_BATCH = 10
 
 MAX_NEWSAPI = 10
 MAX_RSS = 10
@@ -47,6 +52,8 @@ FINAL_ARTICLES = 5
 
 TECH_RSS_FEED = "https://www.wired.com/feed/rss"
 
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
 # ------------------------------------------------------
 # Prompts
 # ------------------------------------------------------
@@ -69,6 +76,16 @@ Title: {title}
 Description: {description}
 """)
 
+BATCH_CLASSIFY_PROMPT = PromptTemplate.from_template("""
+You are given {count} numbered articles.
+For EACH article, decide if it is about {TECH}.
+
+Return ONLY a JSON array of {count} booleans, one per article, in order.
+
+Articles:
+{articles}
+""")
+
 SUMMARY_PROMPT = PromptTemplate.from_template("""
 Summarize the following {TECH} news.
 
@@ -100,41 +117,63 @@ Articles:
 # ------------------------------------------------------
 # Helpers
 # ------------------------------------------------------
-def generate_queries() -> List[str]:
+@lru_cache(maxsize=16)
+def generate_queries(tech: str) -> List[str]:
+    """
+    Memoized per technology: with temperature=0 the LLM output is
+    deterministic, so repeat ticks skip the inference call entirely.
+    """
     logger.info("Generating Tech queries via LLM")
     try:
-        res = llm.invoke(QUERY_PROMPT.format(TECH=TECH))
-        match = re.search(r"\[.*\]", res.content, re.DOTALL)
+        res = llm.invoke(QUERY_PROMPT.format(TECH=tech))
+        match = _JSON_ARRAY_RE.search(res.content)
         if match:
-            queries = json.loads(match.group())
+            queries = orjson.loads(match.group())
             if isinstance(queries, list) and queries:
                 return queries
     except Exception as e:
         logger.warning(f"Query generation failed: {e}")
 
-    return [f"{TECH} news"]
+    return [f"{tech} news"]
 
-def fetch_newsapi_articles(queries: List[str]) -> List[Dict]:
+async def _fetch_newsapi_query(session: aiohttp.ClientSession, q: str) -> List[Dict]:
+    try:
+        data = await fetch_json(
+            session,
+            NEWSAPI_ENDPOINT,
+            params={
+                "q": q,
+                "language": "en",
+                "pageSize": MAX_NEWSAPI,
+                "apiKey": NEWS_API_KEY
+            }
+        )
+        return data.get("articles", [])
+    except Exception as e:
+        logger.error(f"NewsAPI error for query '{q}': {e}")
+        return []
+
+async def fetch_newsapi_articles(
+    session: aiohttp.ClientSession,
+    queries: List[str]
+) -> List[Dict]:
     logger.info("Fetching Tech articles from NewsAPI")
-    articles = []
 
-    for q in queries:
-        try:
-            res = newsapi.get_everything(
-                q=q,
-                language="en",
-                page_size=MAX_NEWSAPI
-            )
-            articles.extend(res.get("articles", []))
-        except Exception as e:
-            logger.error(f"NewsAPI error for query '{q}': {e}")
+    results = await asyncio.gather(
+        *(_fetch_newsapi_query(session, q) for q in queries)
+    )
+    articles = [a for batch in results for a in batch]
 
     logger.info(f"Fetched {len(articles)} NewsAPI articles")
     return articles[:MAX_NEWSAPI]
 
-def fetch_rss_articles() -> List[Dict]:
+async def fetch_rss_articles(session: aiohttp.ClientSession) -> List[Dict]:
     logger.info("Fetching Tech articles from RSS (Wired)")
-    feed = feedparser.parse(TECH_RSS_FEED)
+    try:
+        feed = await fetch_feed(session, TECH_RSS_FEED)
+    except Exception as e:
+        logger.error(f"RSS fetch failed: {e}")
+        return []
 
     articles = []
     for entry in feed.entries[:MAX_RSS]:
@@ -147,29 +186,104 @@ def fetch_rss_articles() -> List[Dict]:
     logger.info(f"Fetched {len(articles)} RSS articles")
     return articles
 
-def deduplicate(articles: List[Dict]) -> List[Dict]:
-    seen = set()
-    unique = []
-    for a in articles:
-        url = a.get("url")
-        if url and url not in seen:
-            seen.add(url)
-            unique.append(a)
-    return unique
+async def _fetch_sources(queries: List[str]):
+    async with make_session() as session:
+        return await asyncio.gather(
+            fetch_newsapi_articles(session, queries),
+            fetch_rss_articles(session)
+        )
 
 def classify_article(article: Dict) -> bool:
-    try:
-        res = llm.invoke(CLASSIFY_PROMPT.format(
+    def _classify() -> bool:
+        prompt = CLASSIFY_PROMPT.format(
             TECH=TECH,
             title=article.get("title", ""),
             description=article.get("summary", "")
-        ))
-        return res.content.strip().upper().startswith("YES")
+        )
+
+        # Only the leading YES/NO matters; stop decoding once it arrives
+        text = ""
+        stream = llm.stream(prompt)
+        try:
+            for chunk in stream:
+                text += chunk.content
+                head = text.strip().upper()
+                if head.startswith("YES") or head.startswith("NO"):
+                    break
+        finally:
+            stream.close()
+
+        return text.strip().upper().startswith("YES")
+
+    try:
+        return classify_cached(
+            f"{article.get('title', '')}\n{article.get('summary', '')}",
+            _classify
+        )
     except Exception as e:
         logger.error(f"Classification error: {e}")
         return False
 
+def _as_label(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().upper() in ("YES", "TRUE", "Y")
+    return bool(value)
+
+def _classify_batch(batch: List[Dict]) -> List[bool]:
+    labels = []
+    vectors = []
+    misses = []
+
+    for idx, a in enumerate(batch):
+        vec, label = classify_lookup(
+            f"{a.get('title', '')}\n{a.get('summary', '')}"
+        )
+        vectors.append(vec)
+        labels.append(label)
+        if label is None:
+            misses.append(idx)
+
+    if not misses:
+        return labels
+
+    numbered = "\n".join(
+        f"{i+1}. {batch[idx].get('title', '')} — {batch[idx].get('summary', '')}"
+        for i, idx in enumerate(misses)
+    )
+
+    decisions = None
+    try:
+        res = llm.invoke(BATCH_CLASSIFY_PROMPT.format(
+            TECH=TECH,
+            count=len(misses),
+            articles=numbered
+        ))
+        decisions = safe_json_loads(res.content)
+    except Exception as e:
+        logger.error(f"Batch classification failed: {e}")
+
+    if isinstance(decisions, list) and len(decisions) == len(misses):
+        for i, idx in enumerate(misses):
+            labels[idx] = _as_label(decisions[i])
+            classify_add(vectors[idx], labels[idx])
+    else:
+        logger.warning("Unparsable batch decisions, classifying per article")
+        for idx in misses:
+            labels[idx] = classify_article(batch[idx])
+
+    return [bool(label) for label in labels]
+
+def classify_articles(articles: List[Dict]) -> List[bool]:
+    labels = []
+    for start in range(0, len(articles), MAX_CLASSIFY_BATCH):
+        labels.extend(_classify_batch(articles[start:start + MAX_CLASSIFY_BATCH]))
+    return labels
+
 def summarize(articles: List[Dict]) -> str:
+    if not need_llm_summary(articles):
+        logger.info("Titles are already clean; skipping LLM summarization")
+        return format_title_bullets(articles)
+
     compact = "\n".join(
         f"Title: {a.get('title')}\nContent: {a.get('summary')}\n"
         for a in articles
@@ -188,24 +302,19 @@ def run_tech_agent() -> Dict:
     logger.info("💻 Running Tech Agent")
 
     # 1. Fetch from both sources
-    rss_articles = fetch_rss_articles()
-    queries = generate_queries()
-    newsapi_articles = fetch_newsapi_articles(queries)
+    queries = generate_queries(TECH)
+    newsapi_articles, rss_articles = asyncio.run(_fetch_sources(queries))
 
     # 2. Combine with fallback logic
-    combined = deduplicate(rss_articles + newsapi_articles)
+    combined = deduplicate_articles(rss_articles + newsapi_articles)
 
     if not combined:
         logger.warning("No Tech articles found from any source")
         return {}
 
-    # 3. LLM classification (parallel)
-    relevant = []
-    with ThreadPoolExecutor(max_workers=MAX_LLM_WORKERS) as executor:
-        futures = {executor.submit(classify_article, a): a for a in combined}
-        for f in as_completed(futures):
-            if f.result():
-                relevant.append(futures[f])
+    # 3. LLM classification (batched: one call per chunk, not per article)
+    labels = classify_articles(combined)
+    relevant = [a for a, keep in zip(combined, labels) if keep]
 
     if not relevant:
         logger.warning("No relevant Tech articles after classification")
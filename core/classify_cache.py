@@ -0,0 +1,85 @@
+import logging
+import threading
+from math import sqrt
+from typing import Callable, List, Optional, Tuple
+
+from langchain_ollama import OllamaEmbeddings
+
+logger = logging.getLogger(__name__)
+
+EMBED_MODEL = "nomic-embed-text"
+SIMILARITY_THRESHOLD = 0.92
+MAX_ENTRIES = 2000
+
+_embedder = OllamaEmbeddings(model=EMBED_MODEL)
+_lock = threading.Lock()
+_vectors: List[List[float]] = []
+_labels: List[bool] = []
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sqrt(sum(x * x for x in a))
+    norm_b = sqrt(sum(y * y for y in b))
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def lookup(text: str) -> Tuple[Optional[List[float]], Optional[bool]]:
+    """
+    Embed the article text and return (vector, cached label).
+    The label is None on a cache miss; the vector is None only when
+    embedding itself failed.
+    """
+    try:
+        vec = _embedder.embed_query(text)
+    except Exception as e:
+        logger.warning(f"Embedding failed, bypassing classify cache: {e}")
+        return None, None
+
+    with _lock:
+        best_score, best_label = 0.0, False
+        for stored, label in zip(_vectors, _labels):
+            score = _cosine(vec, stored)
+            if score > best_score:
+                best_score, best_label = score, label
+
+    if best_score >= SIMILARITY_THRESHOLD:
+        return vec, best_label
+
+    return vec, None
+
+
+def add(vec: Optional[List[float]], label: bool) -> None:
+    """
+    Store a classified (vector, label) pair for future lookups.
+    """
+    if vec is None:
+        return
+
+    with _lock:
+        if len(_vectors) >= MAX_ENTRIES:
+            _vectors.pop(0)
+            _labels.pop(0)
+        _vectors.append(vec)
+        _labels.append(label)
+
+
+def classify_cached(text: str, classify: Callable[[], bool]) -> bool:
+    """
+    Semantic cache for binary YES/NO article classifications.
+
+    Reuses the label of the most similar previously classified article
+    when cosine similarity reaches the threshold; otherwise calls
+    `classify` and stores its result. Articles often reappear across
+    scheduler ticks under near-identical titles, so most classify LLM
+    calls become lookups after warm-up.
+    """
+    vec, label = lookup(text)
+    if label is not None:
+        return label
+
+    label = classify()
+    add(vec, label)
+    return label
@@ -1,6 +1,7 @@
 # emailer.py
 import os
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
@@ -11,6 +12,47 @@ EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASS = os.getenv("EMAIL_PASS")
 EMAIL_TO = os.getenv("EMAIL_TO")
 
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+
+
+class _Mailer:
+    """
+    Keeps one authenticated SMTP connection alive across digest sends,
+    reconnecting when the server drops it. Saves the TCP + STARTTLS +
+    AUTH handshake on every scheduler tick.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._smtp = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+        smtp.starttls()
+        smtp.login(EMAIL_USER, EMAIL_PASS)
+        return smtp
+
+    def send(self, msg) -> None:
+        with self._lock:
+            if self._smtp is None:
+                self._smtp = self._connect()
+
+            try:
+                self._smtp.send_message(msg)
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPSenderRefused):
+                # Stale connection (Gmail idles out): reconnect and retry once
+                try:
+                    self._smtp.close()
+                except Exception:
+                    pass
+                self._smtp = self._connect()
+                self._smtp.send_message(msg)
+
+
+_mailer = _Mailer()
+
+
 def send_digest_email(subject: str, html_body: str) -> None:
     """
     Send HTML email via Gmail using only EMAIL_USER, EMAIL_PASS, and EMAIL_TO.
@@ -22,9 +64,6 @@ def send_digest_email(subject: str, html_body: str) -> None:
 
     msg.attach(MIMEText(html_body, "html"))
 
-    with smtplib.SMTP("smtp.gmail.com", 587) as server:
-        server.starttls()
-        server.login(EMAIL_USER, EMAIL_PASS)
-        server.send_message(msg)
+    _mailer.send(msg)
 
     print(f"✅ Email sent to {EMAIL_TO} with subject '{subject}'")
@@ -0,0 +1,90 @@
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+import feedparser
+
+logger = logging.getLogger(__name__)
+
+NEWSAPI_ENDPOINT = "https://newsapi.org/v2/everything"
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+# url -> (etag, last_modified, parsed feed) for conditional RSS GETs
+_feed_cache: Dict[str, tuple] = {}
+
+
+def make_session() -> aiohttp.ClientSession:
+    """
+    Build the ClientSession used for one agent run: keep-alive
+    connections with a per-host cap and a shared DNS cache, so the
+    NewsAPI fan-out and RSS fetches reuse sockets within the run.
+    """
+    return aiohttp.ClientSession(
+        timeout=DEFAULT_TIMEOUT,
+        connector=aiohttp.TCPConnector(
+            limit_per_host=4,
+            ttl_dns_cache=300
+        )
+    )
+
+
+async def fetch_json(
+    session: aiohttp.ClientSession,
+    url: str,
+    params: Optional[Dict] = None,
+    headers: Optional[Dict] = None
+) -> Dict:
+    """
+    GET a URL and decode the JSON body.
+    Raises on non-2xx responses.
+    """
+    async with session.get(url, params=params, headers=headers) as resp:
+        resp.raise_for_status()
+        return await resp.json()
+
+
+async def fetch_bytes(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: Optional[Dict] = None
+) -> bytes:
+    """
+    GET a URL and return the raw body bytes.
+    Raises on non-2xx responses.
+    """
+    async with session.get(url, headers=headers) as resp:
+        resp.raise_for_status()
+        return await resp.read()
+
+
+async def fetch_feed(
+    session: aiohttp.ClientSession,
+    url: str
+) -> feedparser.FeedParserDict:
+    """
+    Fetch and parse an RSS feed using ETag/Last-Modified conditional
+    GETs. On 304 Not Modified the previously parsed feed is returned,
+    skipping both the transfer and the XML parse.
+    """
+    etag, last_modified, cached = _feed_cache.get(url, (None, None, None))
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    async with session.get(url, headers=headers) as resp:
+        if resp.status == 304 and cached is not None:
+            logger.info(f"RSS feed not modified: {url}")
+            return cached
+
+        resp.raise_for_status()
+        raw = await resp.read()
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+
+    feed = feedparser.parse(raw)
+    _feed_cache[url] = (etag, last_modified, feed)
+    return feed
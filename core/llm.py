@@ -1,16 +1,23 @@
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 from langchain_ollama import ChatOllama
 
+from .llm_cache import CachedLLM
+
 load_dotenv()
 
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
 
-def get_llm(temperature: float = 0.0) -> ChatOllama:
+@lru_cache(maxsize=None)
+def get_llm(temperature: float = 0.0) -> CachedLLM:
     """
-    Returns a configured ChatOllama instance.
+    Returns the shared ChatOllama instance for a temperature, wrapped
+    in the on-disk response cache. Memoized so every agent reuses one
+    client, one HTTP pool, and one cache connection per process.
     """
-    return ChatOllama(
+    return CachedLLM(ChatOllama(
         model=OLLAMA_MODEL,
         temperature=temperature
-    )
+    ))
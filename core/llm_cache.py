@@ -0,0 +1,69 @@
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from langchain_core.messages import AIMessage
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".llm_cache.db")
+
+
+class CachedLLM:
+    """
+    Wraps a chat model and memoizes .invoke results in a SQLite file.
+
+    With temperature=0 the same prompt produces the same completion,
+    so prompts repeated across scheduler ticks (query generation,
+    classification) become lookups instead of new inference calls.
+    Keys are sha1(model | temperature | prompt).
+    """
+
+    def __init__(self, llm, cache_path: str = CACHE_PATH):
+        self._llm = llm
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(cache_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, content TEXT)"
+        )
+        self._db.commit()
+
+    def _key(self, prompt_text: str) -> str:
+        raw = "|".join([
+            str(getattr(self._llm, "model", "")),
+            str(getattr(self._llm, "temperature", "")),
+            prompt_text
+        ])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def invoke(self, prompt) -> AIMessage:
+        key = self._key(str(prompt))
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is not None:
+            return AIMessage(content=row[0])
+
+        res = self._llm.invoke(prompt)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, content) VALUES (?, ?)",
+                (key, res.content)
+            )
+            self._db.commit()
+
+        return res
+
+    def stream(self, prompt):
+        # Streaming responses may be consumed partially, so they bypass the cache
+        return self._llm.stream(prompt)
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
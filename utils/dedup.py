@@ -7,18 +7,16 @@ def deduplicate_articles(
 ) -> List[Dict]:
     """
     Remove duplicate articles based on a unique key (default: url).
-    Preserves order.
+    Keeps the first occurrence and preserves order.
     """
-    seen = set()
-    unique = []
+    # dict.fromkeys gives the ordered unique key set in one C-level pass
+    slots = dict.fromkeys(
+        article.get(key) for article in articles if article.get(key)
+    )
 
     for article in articles:
         value = article.get(key)
-        if not value:
-            continue
+        if value and slots[value] is None:
+            slots[value] = article
 
-        if value not in seen:
-            seen.add(value)
-            unique.append(article)
-
-    return unique
+    return list(slots.values())
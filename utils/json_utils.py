@@ -1,27 +1,61 @@
-import json
 import re
 from typing import Any, Optional
 
+import orjson
+
+_FENCE_RE = re.compile(r"^```(?:json)?|```$", re.MULTILINE)
+
+_OPEN_TO_CLOSE = {"{": "}", "[": "]"}
+
 
 def extract_json_block(text: str) -> Optional[str]:
     """
-    Extracts the first JSON array or object from text.
+    Extracts the first balanced JSON array or object from text.
     Handles LLM outputs with explanations or code fences.
+
+    Uses a single-pass bracket counter (string literals respected)
+    instead of a greedy regex, so multi-KB or malformed output is
+    scanned in O(n) with no backtracking.
     """
     if not text:
         return None
 
-    text = text.strip()
-
     # Remove markdown fences if present
-    text = re.sub(r"^```(?:json)?|```$", "", text, flags=re.MULTILINE).strip()
+    text = _FENCE_RE.sub("", text.strip()).strip()
 
-    # Match JSON object or array
-    match = re.search(r"(\{.*\}|\[.*\])", text, re.DOTALL)
-    if not match:
+    start = next((i for i, ch in enumerate(text) if ch in _OPEN_TO_CLOSE), None)
+    if start is None:
         return None
 
-    return match.group(1)
+    open_ch = text[start]
+    close_ch = _OPEN_TO_CLOSE[open_ch]
+
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
 
 
 def safe_json_loads(text: str) -> Optional[Any]:
@@ -34,6 +68,6 @@ def safe_json_loads(text: str) -> Optional[Any]:
         return None
 
     try:
-        return json.loads(json_block)
-    except json.JSONDecodeError:
+        return orjson.loads(json_block)
+    except orjson.JSONDecodeError:
         return None
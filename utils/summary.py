@@ -0,0 +1,31 @@
+from typing import Dict, List
+
+MAX_CLEAN_TITLE_LEN = 120
+
+_AMBIGUITY_MARKERS = ("...", "…", "?", ":")
+
+
+def need_llm_summary(articles: List[Dict]) -> bool:
+    """
+    Decide whether a digest section needs an LLM summarization pass.
+
+    Editorialized titles — short, untruncated, no teaser punctuation —
+    already read as bullet points, so rendering them directly saves an
+    LLM call. Returns True as soon as any title looks unsuitable.
+    """
+    for article in articles:
+        title = (article.get("title") or "").strip()
+        if not title or len(title) > MAX_CLEAN_TITLE_LEN:
+            return True
+        if title.endswith(_AMBIGUITY_MARKERS):
+            return True
+    return False
+
+
+def format_title_bullets(articles: List[Dict]) -> str:
+    """
+    Render article titles as digest bullets without the LLM.
+    """
+    return "\n".join(
+        f"• {(a.get('title') or '').strip()}" for a in articles
+    )